@@ -1,17 +1,81 @@
 import subprocess
 import sys
 
+# 可选加速：libgit2 绑定可直接读取索引中的缓存 diff，免去 fork/exec
+# 与 git 文本渲染的开销；未安装时回退到 subprocess 机器格式。
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+
+def _format_stats(entries, insertions, deletions):
+    # 在 Python 侧渲染统计文本，git 只需输出机器格式。
+    lines = [
+        f" {path} | +{added} -{deleted}" for path, added, deleted in entries
+    ]
+    lines.append(
+        f" {len(entries)} 个文件改动，插入 {insertions} 行，删除 {deletions} 行"
+    )
+    return "\n".join(lines)
+
+
+def _diff_via_pygit2():
+    repo = pygit2.Repository(".")
+    diff = repo.diff("HEAD", cached=True)
+    stats = diff.stats
+    if stats.files_changed == 0:
+        return None
+    return stats.format(pygit2.GIT_DIFF_STATS_FULL, 80)
+
+
+def _diff_via_subprocess():
+    # --numstat -z 为机器格式：跳过 git 的对齐/渲染过程，
+    # 记录形如 "added\tdeleted\tpath\0"，重命名额外跟随新旧两段路径。
+    result = subprocess.run(
+        ["git", "diff", "--cached", "--numstat", "-z"],
+        capture_output=True, check=True,
+    )
+    tokens = result.stdout.decode("utf-8", "replace").split("\0")
+    entries = []
+    insertions = deletions = 0
+    index = 0
+    while index < len(tokens):
+        record = tokens[index]
+        index += 1
+        if not record:
+            continue
+        added, deleted, path = record.split("\t", 2)
+        if not path:
+            # 重命名记录：路径位于随后的两段（旧路径、新路径）。
+            path = f"{tokens[index]} => {tokens[index + 1]}"
+            index += 2
+        # 二进制文件的计数为 "-"，不参与行数汇总。
+        if added != "-":
+            insertions += int(added)
+        if deleted != "-":
+            deletions += int(deleted)
+        entries.append((path, added, deleted))
+    if not entries:
+        return None
+    return _format_stats(entries, insertions, deletions)
+
+
 def get_git_diff():
     # 获取已暂存的更改
+    if pygit2 is not None:
+        try:
+            return _diff_via_pygit2()
+        # 首次提交前 HEAD 尚未诞生时，revparse 的 GIT_ENOTFOUND 被
+        # pygit2 映射为 KeyError 而非 GitError，同样落回 subprocess。
+        except (pygit2.GitError, KeyError):
+            pass
     try:
-        result = subprocess.run(
-            ['git', 'diff', '--cached', '--stat'],
-            capture_output=True, text=True, check=True
-        )
-        return result.stdout
+        return _diff_via_subprocess()
     except subprocess.CalledProcessError:
         return None
 
+
 def main():
     diff = get_git_diff()
     if not diff:
@@ -24,5 +88,6 @@ def main():
     print("-" * 30)
     print("\n建议格式：<type>(<scope>): <subject>")
 
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
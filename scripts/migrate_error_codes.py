@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""goagent 错误码迁移脚本。
+
+将 staging/src/github.com/kart-io/goagent 中旧版细粒度错误码常量与
+辅助函数批量替换为新版统一错误码体系（设计背景参见
+docs/design/MIGRATION.md）。
+
+迁移经 gofmt -r 以 AST 级改写完成：gofmt 解析一次语法树后仅改写
+`errors.` / `agentErrors.` 选择器表达式，字符串字面量与注释天然
+不受影响，正确性由语法树保证；本脚本只负责编排——枚举文件、
+生成改写规则并调度 gofmt。vendor 与 errors 包目录本身不参与改写。
+
+用法：
+    python3 scripts/migrate_error_codes.py [目标目录]
+
+不指定目标目录时默认处理 staging 下的 goagent 树。
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOAGENT_DIR = os.path.join(
+    ROOT_DIR, "staging", "src", "github.com", "kart-io", "goagent"
+)
+
+# 不参与改写的目录：vendor 为第三方代码，errors 为错误码定义包本身。
+SKIP_DIRS = {"vendor", "errors"}
+
+# 旧错误码常量 -> 新统一错误码常量。
+# 多个旧码合并到同一新码（如 CodeNotFound）属于预期收敛，不是笔误。
+ERROR_CODE_MAPPING = {
+    # 请求/校验类
+    "CodeAgentValidation": "CodeInvalidParam",
+    "CodeInvalidRequest": "CodeInvalidParam",
+    "CodeInvalidPayload": "CodeInvalidParam",
+    "CodeMissingParam": "CodeInvalidParam",
+    "CodeBadToolInput": "CodeToolValidation",
+    "CodeBadToolOutput": "CodeToolValidation",
+    # 认证/授权类
+    "CodeAgentUnauthorized": "CodeUnauthorized",
+    "CodeTokenExpired": "CodeUnauthorized",
+    "CodeTokenInvalid": "CodeUnauthorized",
+    "CodeAgentForbidden": "CodeForbidden",
+    "CodePermissionDenied": "CodeForbidden",
+    # 资源类：统一收敛到 CodeNotFound
+    "CodeAgentNotFound": "CodeNotFound",
+    "CodeToolNotFound": "CodeNotFound",
+    "CodeSessionNotFound": "CodeNotFound",
+    "CodeTaskNotFound": "CodeNotFound",
+    "CodeMemoryNotFound": "CodeNotFound",
+    "CodePluginNotFound": "CodeNotFound",
+    "CodeModelNotFound": "CodeNotFound",
+    # 冲突类
+    "CodeAgentExists": "CodeAlreadyExists",
+    "CodeSessionExists": "CodeAlreadyExists",
+    "CodeTaskConflict": "CodeConflict",
+    "CodeStateConflict": "CodeConflict",
+    # 限流类
+    "CodeAgentThrottled": "CodeRateLimited",
+    "CodeLLMThrottled": "CodeRateLimited",
+    "CodeQuotaExceeded": "CodeRateLimited",
+    # 超时类：统一收敛到 CodeAgentTimeout
+    "CodeAgentExecTimeout": "CodeAgentTimeout",
+    "CodeAgentCallTimeout": "CodeAgentTimeout",
+    "CodeToolTimeout": "CodeAgentTimeout",
+    "CodeLLMTimeout": "CodeAgentTimeout",
+    "CodeSessionTimeout": "CodeAgentTimeout",
+    # 网络类：统一收敛到 CodeNetwork
+    "CodeConnRefused": "CodeNetwork",
+    "CodeConnReset": "CodeNetwork",
+    "CodeDNSFailure": "CodeNetwork",
+    "CodeTLSHandshake": "CodeNetwork",
+    "CodeProxyError": "CodeNetwork",
+    "CodeUpstreamUnavailable": "CodeNetwork",
+    # 执行类
+    "CodeAgent": "CodeAgentInternal",
+    "CodeAgentExec": "CodeAgentExecution",
+    "CodeAgentExecFailed": "CodeAgentExecution",
+    "CodeAgentPanic": "CodeAgentExecution",
+    "CodeToolExec": "CodeToolExecution",
+    "CodeToolExecFailed": "CodeToolExecution",
+    "CodeToolPanic": "CodeToolExecution",
+    "CodeCallbackFailed": "CodeAgentExecution",
+    # LLM 类
+    "CodeLLMRequest": "CodeLLMInvocation",
+    "CodeLLMResponse": "CodeLLMInvocation",
+    "CodeLLMStreamBroken": "CodeLLMInvocation",
+    "CodeLLMContextOverflow": "CodeLLMContext",
+    "CodeLLMTokenLimit": "CodeLLMContext",
+    # 记忆/存储类
+    "CodeMemoryRead": "CodeMemoryAccess",
+    "CodeMemoryWrite": "CodeMemoryAccess",
+    "CodeMemoryCorrupted": "CodeMemoryAccess",
+    "CodeStoreUnavailable": "CodeStorage",
+    "CodeStoreIO": "CodeStorage",
+    # 配置类
+    "CodeConfigMissing": "CodeConfig",
+    "CodeConfigInvalid": "CodeConfig",
+    "CodeEnvMissing": "CodeConfig",
+    # 内部类
+    "CodeInternalError": "CodeInternal",
+    "CodeNotImplemented": "CodeInternal",
+    "CodeSerialization": "CodeInternal",
+}
+
+# 旧辅助函数 -> 新辅助函数。多个旧函数合并到同一新函数属于预期收敛。
+HELPER_FUNC_MAPPING = {
+    "NewAgentError": "NewError",
+    "NewAgentErrorf": "NewErrorf",
+    "NewToolError": "NewError",
+    "WrapAgentError": "WrapError",
+    "WrapToolError": "WrapError",
+    "IsAgentNotFound": "IsNotFound",
+    "IsToolNotFound": "IsNotFound",
+    "IsAgentTimeout": "IsTimeout",
+    "IsToolTimeout": "IsTimeout",
+    "AgentErrorCode": "GetCode",
+    "ToolErrorCode": "GetCode",
+    "AgentErrorMessage": "GetMessage",
+    "FromAgentError": "FromError",
+    "IsRetryableAgentError": "IsRetryable",
+}
+
+# 合并两张映射表并同步检测冲突：同一旧名指向两个不同新名属于
+# 笔误，直接在导入期失败，避免迁移产出不一致的改写。
+_SOURCE_TO_TARGET = {}
+for _mapping in (ERROR_CODE_MAPPING, HELPER_FUNC_MAPPING):
+    for _old, _new in _mapping.items():
+        _existing = _SOURCE_TO_TARGET.get(_old)
+        if _existing is not None and _existing != _new:
+            raise ValueError(
+                f"映射冲突：{_old} 同时指向 {_existing} 与 {_new}"
+            )
+        _SOURCE_TO_TARGET[_old] = _new
+
+# gofmt -r 规则：每个旧名在两种选择器前缀下各生成一条表达式改写。
+_REWRITE_RULES = tuple(
+    f"{prefix}.{old} -> {prefix}.{new}"
+    for old, new in _SOURCE_TO_TARGET.items()
+    for prefix in ("errors", "agentErrors")
+)
+
+# 单次 gofmt 调用携带的文件数，控制 argv 长度并留出并行度。
+_CHUNK_SIZE = 200
+
+
+def iter_go_files(root):
+    """以 scandir 迭代遍历 root 下的 Go 文件，流式产出路径。
+
+    DirEntry 自带类型缓存，判断目录/文件不触发额外 stat 系统调用；
+    SKIP_DIRS 中的目录在入栈前即被剪枝。
+    """
+    stack = [root]
+    while stack:
+        dirpath = stack.pop()
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".go") and entry.is_file(
+                    follow_symlinks=False
+                ):
+                    yield entry.path
+
+
+def iter_target_files(target_dir):
+    """流式产出待迁移的 Go 文件路径，优先读取 git 索引。
+
+    git ls-files 直接流式读取打包索引，免去整树 stat 遍历，且天然遵守
+    .gitignore 与子模块边界。git 不可用、目标目录不在仓库内，或虽在
+    仓库内但 Go 文件未被跟踪（如整树拷入 staging 的导出源码包，
+    ls-files 会以零输出正常退出）时，回退到 iter_go_files；零产出时
+    回退不会重复产出路径。
+    """
+    try:
+        proc = subprocess.Popen(
+            [
+                "git", "-C", target_dir, "ls-files", "-z", "--",
+                "*.go",
+                ":!vendor/**", ":!**/vendor/**",
+                ":!errors/**", ":!**/errors/**",
+            ],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+    except OSError:
+        yield from iter_go_files(target_dir)
+        return
+    yielded = False
+    with proc:
+        pending = b""
+        for chunk in iter(lambda: proc.stdout.read(65536), b""):
+            pending += chunk
+            records = pending.split(b"\0")
+            pending = records.pop()
+            for record in records:
+                if record:
+                    yielded = True
+                    yield os.path.join(target_dir, record.decode())
+    if not yielded:
+        yield from iter_go_files(target_dir)
+
+
+def _apply_rule(rule, file_chunk):
+    """对一批文件应用单条 gofmt -r 改写规则，原地写回。"""
+    subprocess.run(
+        ["gofmt", "-r", rule, "-w", *file_chunk],
+        check=True,
+    )
+
+
+def main():
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else GOAGENT_DIR
+    if not os.path.isdir(target_dir):
+        print(f"错误：目标目录不存在：{target_dir}")
+        sys.exit(1)
+    if shutil.which("gofmt") is None:
+        print("错误：未找到 gofmt，请先安装 Go 工具链。")
+        sys.exit(1)
+
+    go_files = list(iter_target_files(target_dir))
+    if not go_files:
+        print("未发现待迁移的 Go 文件。")
+        return
+
+    chunks = [
+        go_files[i:i + _CHUNK_SIZE]
+        for i in range(0, len(go_files), _CHUNK_SIZE)
+    ]
+
+    # 规则之间串行（同一文件不可并发改写），单条规则内按文件分块
+    # 并行调度 gofmt；list() 耗尽 map 结果即构成规则间的同步屏障。
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for rule in _REWRITE_RULES:
+            list(executor.map(lambda c: _apply_rule(rule, c), chunks))
+
+    print(
+        f"共对 {len(go_files)} 个 Go 文件应用 "
+        f"{len(_REWRITE_RULES)} 条 AST 改写规则。"
+    )
+
+
+if __name__ == "__main__":
+    main()